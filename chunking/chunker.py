@@ -1,11 +1,28 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from dataclasses import dataclass, field
-import uuid
+import hashlib
+import sys
 import tiktoken
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from transform.canonical_models import CanonicalDocument, Section, Block
 
-@dataclass
+# Below this many blocks the Python loop beats numpy's call overhead.
+_NUMPY_MIN_BLOCKS = 16
+
+# Loading an encoding parses the full BPE vocab (~1.8MB) and allocates a
+# fresh Rust CoreBPE object, so share one immutable instance per encoding
+# name across all Chunker instances.
+_ENC_CACHE: Dict[str, "tiktoken.Encoding"] = {}
+
+def _get_encoding(name: str) -> "tiktoken.Encoding":
+    return _ENC_CACHE.setdefault(name, tiktoken.get_encoding(name))
+
+@dataclass(slots=True)
 class Chunk:
     id: str
     doc_id: str
@@ -17,82 +34,166 @@ class Chunk:
 class Chunker:
     def __init__(self, max_tokens: int = 512, model_name: str = "cl100k_base"):
         self.max_tokens = max_tokens
-        self.tokenizer = tiktoken.get_encoding(model_name)
+        self.tokenizer = _get_encoding(model_name)
+        # Token-count cache for repeated block content (boilerplate headers,
+        # footers, template snippets copied across pages).
+        self._tok_len_cache: Dict[str, int] = {}
 
-    def chunk_document(self, doc: CanonicalDocument) -> List[Chunk]:
-        chunks = []
-        
+    def iter_chunks(self, doc: CanonicalDocument) -> Iterator[Chunk]:
+        """
+        Stream chunks in document order with chunk_index assigned as each
+        chunk is created. total_chunks is unknowable mid-stream and stays
+        at its placeholder; use chunk_document when it is needed.
+        """
+        # Document-level metadata is identical for every chunk; build it once
+        # and let each chunk's dict start from a cheap copy instead of
+        # re-reading doc.metadata per chunk. Tuples keep the shared
+        # hierarchy fields immutable across chunks.
+        doc_meta = {
+            "title": doc.title,
+            "url": doc.url,
+            "version": doc.version,
+            "parent_id": doc.metadata.get("parent_id"),
+            "ancestor_ids": tuple(doc.metadata.get("ancestor_ids", ())),
+            "depth": doc.metadata.get("depth", 0),
+            "space_key": doc.metadata.get("space_key")
+        }
+
+        index = 0
         for section in doc.sections:
-            section_chunks = self._chunk_section(section, doc)
-            chunks.extend(section_chunks)
-            
-        # Update total chunks info
+            for chunk in self._chunk_section(section, doc, doc_meta):
+                chunk.chunk_index = index
+                index += 1
+                yield chunk
+
+    def chunk_document(self, doc: CanonicalDocument) -> List[Chunk]:
+        chunks = list(self.iter_chunks(doc))
+
+        # Only total_chunks needs the post-pass; indices were set inline.
         total = len(chunks)
-        for i, chunk in enumerate(chunks):
-            chunk.chunk_index = i
+        for chunk in chunks:
             chunk.total_chunks = total
-            
+
         return chunks
 
-    def _chunk_section(self, section: Section, doc: CanonicalDocument) -> List[Chunk]:
+    def _chunk_section(self, section: Section, doc: CanonicalDocument, doc_meta: Dict[str, Any]) -> List[Chunk]:
         """
         Chunks a section while respecting block boundaries.
         """
         chunks = []
-        current_chunk_blocks = []
-        current_tokens = 0
-        
-        # Calculate heading tokens to add context if needed, 
+
+        # Calculate heading tokens to add context if needed,
         # but for now we only count them if we decide to prepend them.
         # User requirement: "Chunk by section first".
-        
-        for block in section.blocks:
-            block_content = block.content
-            if not block_content:
-                continue
-                
-            block_tokens = len(self.tokenizer.encode(block_content))
-            
+
+        nonempty = [b for b in section.blocks if b.content]
+        if not nonempty:
+            return chunks
+
+        token_lens = self._token_lens([b.content for b in nonempty])
+
+        if np is not None and len(nonempty) >= _NUMPY_MIN_BLOCKS:
+            return self._pack_vectorized(nonempty, token_lens, section, doc, doc_meta)
+
+        # Bind the config to a local so the per-block condition does a
+        # LOAD_FAST instead of an attribute lookup.
+        max_tokens = self.max_tokens
+
+        current_chunk_blocks = []
+        current_tokens = 0
+
+        for block, block_tokens in zip(nonempty, token_lens):
             # If adding this block exceeds max_tokens...
-            if current_chunk_blocks and (current_tokens + block_tokens > self.max_tokens):
+            if current_chunk_blocks and (current_tokens + block_tokens > max_tokens):
                 # Finalize current chunk
-                chunks.append(self._create_chunk(current_chunk_blocks, section, doc))
+                chunks.append(self._create_chunk(current_chunk_blocks, section, doc, doc_meta))
                 current_chunk_blocks = []
                 current_tokens = 0
-            
+
             current_chunk_blocks.append(block)
             current_tokens += block_tokens
-            
+
         # Finalize last chunk
         if current_chunk_blocks:
-            chunks.append(self._create_chunk(current_chunk_blocks, section, doc))
-            
+            chunks.append(self._create_chunk(current_chunk_blocks, section, doc, doc_meta))
+
+        return chunks
+
+    def _pack_vectorized(self, blocks: List[Block], token_lens: List[int],
+                         section: Section, doc: CanonicalDocument,
+                         doc_meta: Dict[str, Any]) -> List[Chunk]:
+        """
+        Greedy packing via prefix sums: chunk boundaries are found with
+        np.searchsorted on the cumulative token counts instead of a
+        Python-level branch per block. Same packing as the loop in
+        _chunk_section, including oversized blocks forming their own chunk.
+        """
+        csum = np.cumsum(np.asarray(token_lens, dtype=np.int64))
+        max_tokens = self.max_tokens
+
+        boundaries = []
+        target = max_tokens
+        total = int(csum[-1])
+        while target < total:
+            idx = int(np.searchsorted(csum, target, side="right"))
+            # A single block larger than max_tokens still gets its own chunk.
+            last = boundaries[-1] if boundaries else 0
+            if idx <= last:
+                idx = last + 1
+            boundaries.append(idx)
+            target = int(csum[idx - 1]) + max_tokens
+
+        chunks = []
+        start = 0
+        for end in boundaries + [len(blocks)]:
+            if end > start:
+                chunks.append(self._create_chunk(blocks[start:end], section, doc, doc_meta))
+                start = end
         return chunks
 
-    def _create_chunk(self, blocks: List[Block], section: Section, doc: CanonicalDocument) -> Chunk:
+    def _token_lens(self, texts: List[str]) -> List[int]:
+        """
+        Token counts for a list of texts, served from the cache where possible.
+
+        Cache misses are tokenized in one batch call so the per-block FFI
+        overhead into tiktoken is paid once per section, not once per block.
+        encode_ordinary skips the special-token scan, which we don't need
+        for plain page content.
+        """
+        cache = self._tok_len_cache
+        if len(cache) > 8192:
+            cache.clear()
+
+        misses = [t for t in texts if t not in cache]
+        if misses:
+            token_lists = self.tokenizer.encode_ordinary_batch(misses)
+            for text, tokens in zip(misses, token_lists):
+                cache[text] = len(tokens)
+
+        return [cache[t] for t in texts]
+
+    def _create_chunk(self, blocks: List[Block], section: Section, doc: CanonicalDocument, doc_meta: Dict[str, Any]) -> Chunk:
         # Join block content
-        content = "\n\n".join([b.content for b in blocks])
+        content = "\n\n".join(b.content for b in blocks)
         
-        # Generate stable ID if possible, or random
-        chunk_id = str(uuid.uuid4())
+        # Deterministic ID from the chunk's identity, so re-ingesting the
+        # same document produces the same IDs and upserts become no-ops
+        # instead of duplicates.
+        key = f"{doc.id}|{section.level}|{section.heading}|{content}"
+        chunk_id = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
         
+        metadata = dict(doc_meta)
+        # Headings and block type names are low-cardinality; interning lets
+        # every chunk metadata dict point at the same string objects.
+        metadata["section_heading"] = sys.intern(section.heading) if section.heading else section.heading
+        metadata["section_level"] = section.level
+        metadata["block_types"] = tuple(sys.intern(b.type) for b in blocks)
+
         return Chunk(
             id=chunk_id,
             doc_id=doc.id,
             chunk_index=0, # Placeholder
             total_chunks=0, # Placeholder
             text=content,
-            metadata={
-                "title": doc.title,
-                "url": doc.url,
-                "version": doc.version,
-                "section_heading": section.heading,
-                "section_level": section.level,
-                "block_types": [b.type.value for b in blocks],
-                # Hierarchy metadata
-                "parent_id": doc.metadata.get("parent_id"),
-                "ancestor_ids": doc.metadata.get("ancestor_ids", []),
-                "depth": doc.metadata.get("depth", 0),
-                "space_key": doc.metadata.get("space_key")
-            }
+            metadata=metadata
         )
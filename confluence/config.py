@@ -32,8 +32,13 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_EMBEDDING_MODEL = os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text")
 
 # Vector Store Settings
+MONGO_VECTOR_COLLECTION = os.getenv("MONGO_VECTOR_COLLECTION", "chunk_embeddings")
+MONGO_VECTOR_INDEX_NAME = os.getenv("MONGO_VECTOR_INDEX_NAME", "vector_index")
 QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", 6334))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() in ("1", "true", "yes")
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", 60))
 QDRANT_COLLECTION_NAME = os.getenv("QDRANT_COLLECTION_NAME", "confluence_chunks")
 
 
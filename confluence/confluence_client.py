@@ -1,7 +1,15 @@
 import httpx
 import logging
 import asyncio
-from typing import AsyncGenerator, Dict, Any
+import random
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements
+    import json
+    _loads = json.loads
+from typing import AsyncGenerator, Dict, Any, Optional
 from urllib.parse import urljoin
 
 from .config import (
@@ -27,16 +35,47 @@ class ConfluenceClient:
 
         self.auth = (CONFLUENCE_USERNAME, CONFLUENCE_API_TOKEN)
         self.timeout = httpx.Timeout(30.0, connect=60.0)
-        self.limits = httpx.Limits(max_keepalive_connections=5, max_connections=10)
+        self.limits = httpx.Limits(
+            max_keepalive_connections=32,
+            max_connections=64,
+            keepalive_expiry=60.0,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Lazily build one shared AsyncClient. HTTP/2 lets concurrent search
+        and body requests multiplex over a single TLS connection.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=True,
+            )
+        return self._client
+
+    async def __aenter__(self):
+        self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the shared HTTP client and its connection pool."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
 
     async def _make_request(
         self,
-        client: httpx.AsyncClient,
         method: str,
         endpoint: str,
         params: Dict[str, Any] = None,
     ) -> Dict[str, Any]:
 
+        client = self._get_client()
+
         if endpoint.startswith("http"):
             url = endpoint
         else:
@@ -60,7 +99,9 @@ class ConfluenceClient:
                     continue
 
                 response.raise_for_status()
-                return response.json()
+                # orjson decodes the raw UTF-8 bytes directly, skipping the
+                # str decode that response.json() would do first.
+                return _loads(response.content)
 
             except httpx.HTTPStatusError as e:
                 if e.response.status_code < 500 and e.response.status_code != 429:
@@ -75,7 +116,10 @@ class ConfluenceClient:
                     f"Request error (Attempt {attempt + 1}/{retries}): {e}"
                 )
 
-            await asyncio.sleep(2 ** attempt)
+            # Exponential backoff with jitter: with 16 workers retrying in
+            # lockstep, a bare 2**attempt sends every retry at the same
+            # instant and re-overloads the server that just failed.
+            await asyncio.sleep(min(30, 2 ** attempt) + random.random() * 0.25)
 
         raise Exception(f"Failed to fetch {url} after {retries} attempts.")
 
@@ -95,51 +139,64 @@ class ConfluenceClient:
 
         return urljoin(self.domain + "/", next_link)
 
+    async def get_page_body(self, page_id: str) -> str:
+        """
+        Fetch the ADF body for a single page.
+        Bodies are no longer expanded in the search listing, so only pages
+        that actually changed pay for the body transfer.
+        """
+        data = await self._make_request(
+            "GET",
+            f"content/{page_id}",
+            {"expand": "body.atlas_doc_format"},
+        )
+
+        return data.get("body", {}).get("atlas_doc_format", {}).get("value", "")
+
     async def get_updated_pages(
         self, since_date: str
     ) -> AsyncGenerator[Dict[str, Any], None]:
 
+        # The date is interpolated into the CQL string; strip quotes so a
+        # malformed sync date can't break out of the literal.
+        since_date = since_date.replace("'", "")
+
         cql = (
             f"type=page AND lastmodified > '{since_date}' "
             f"ORDER BY lastmodified"
         )
 
-        limit = CONFLUENCE_CLIENT_PAGE_LIMIT
+        # Params for the first request are constant; later iterations follow
+        # the server-provided next link, so build the dict once.
+        initial_params = {
+            "cql": cql,
+            "expand": "version,ancestors,space",
+            "limit": CONFLUENCE_CLIENT_PAGE_LIMIT,
+        }
         next_url = None
 
-        async with httpx.AsyncClient(
-            timeout=self.timeout,
-            limits=self.limits,
-        ) as client:
-
-            while True:
-                if next_url:
-                    data = await self._make_request(
-                        client,
-                        "GET",
-                        next_url,
-                        None,
-                    )
-                else:
-                    data = await self._make_request(
-                        client,
-                        "GET",
-                        "content/search",
-                        {
-                            "cql": cql,
-                            "expand": "body.atlas_doc_format,version,ancestors,space",
-                            "limit": limit,
-                        },
-                    )
-
-                results = data.get("results", [])
-
-                for page in results:
-                    yield page
-
-                next_link = data.get("_links", {}).get("next")
-
-                if not next_link:
-                    break
-
-                next_url = self._normalize_next_link(next_link)
+        while True:
+            if next_url:
+                data = await self._make_request(
+                    "GET",
+                    next_url,
+                    None,
+                )
+            else:
+                data = await self._make_request(
+                    "GET",
+                    "content/search",
+                    initial_params,
+                )
+
+            results = data.get("results", [])
+
+            for page in results:
+                yield page
+
+            next_link = data.get("_links", {}).get("next")
+
+            if not next_link:
+                break
+
+            next_url = self._normalize_next_link(next_link)
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from .config import MONGO_URI
+
+# One client per process: MongoStorage and MongoVectorStore used to each
+# spin up their own pool, monitor threads and SDAM heartbeats against the
+# same server. Sharing the pool also lets their bulk writes multiplex over
+# the same connections.
+_client: Optional[AsyncIOMotorClient] = None
+
+def get_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            MONGO_URI,
+            maxPoolSize=100,
+            # Wire-protocol compression; embedding payloads shrink several
+            # fold without touching the document format.
+            compressors="zstd",
+        )
+    return _client
@@ -1,21 +1,37 @@
+import asyncio
 import logging
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import UpdateOne
+from bson.binary import Binary
+from pymongo import UpdateOne, ReplaceOne
 
-from .config import MONGO_URI, MONGO_DB_NAME, DEFAULT_SYNC_DATE
+try:
+    import zstandard as zstd
+    _cctx = zstd.ZstdCompressor(level=3)
+    _dctx = zstd.ZstdDecompressor()
+except ImportError:
+    _cctx = _dctx = None
+
+from .config import MONGO_DB_NAME, DEFAULT_SYNC_DATE
+from .mongo_client import get_client
 
 logger = logging.getLogger(__name__)
 
 class MongoStorage:
     def __init__(self):
-        self.client = AsyncIOMotorClient(MONGO_URI)
+        self.client = get_client()
         self.db = self.client[MONGO_DB_NAME]
         self.pages_col = self.db["pages"]
         self.versions_col = self.db["page_versions"]
         self.sync_state_col = self.db["sync_state"]
+
+        # Buffered write ops; flushed as unordered bulk_writes so a sync
+        # issues a handful of round-trips per collection, not two per page.
+        self._version_ops: List[ReplaceOne] = []
+        self._page_ops: List[ReplaceOne] = []
+        self._flush_threshold = 500
+        self._flush_lock = asyncio.Lock()
         
     async def ensure_indexes(self):
         """Create necessary indexes for performance."""
@@ -46,11 +62,30 @@ class MongoStorage:
         """Retrieve metadata for a specific page."""
         return await self.pages_col.find_one({"_id": page_id})
 
-    async def save_page(self, page_id: str, metadata: Dict[str, Any], content: str, version: int, content_hash: str):
+    async def update_page_metadata(self, page_id: str, metadata: Dict[str, Any]):
+        """
+        Replace page metadata without touching stored version content.
+        Used when a version bump turns out to be metadata-only.
         """
-        Save both content (versioned) and metadata (current state) in a transaction-like manner.
+        metadata["_id"] = page_id
+        metadata["last_updated_at"] = datetime.now(timezone.utc)
+        await self.pages_col.replace_one({"_id": page_id}, metadata, upsert=True)
+
+    async def get_metadata_bulk(self, page_ids: List[str]) -> Dict[str, Dict[str, Any]]:
         """
-        # 1. Save Content Version
+        Fetch the version-check fields for many pages in one query,
+        keyed by page id. One round-trip instead of one per page.
+        """
+        if not page_ids:
+            return {}
+        cursor = self.pages_col.find(
+            {"_id": {"$in": page_ids}},
+            {"version": 1, "content_hash": 1, "latest_version_id": 1}
+        )
+        return {doc["_id"]: doc async for doc in cursor}
+
+    def _append_page_ops(self, page_id: str, metadata: Dict[str, Any], content: str,
+                         version: int, content_hash: str, now: datetime):
         version_id = f"{page_id}_v{version}"
         version_doc = {
             "_id": version_id,
@@ -58,56 +93,132 @@ class MongoStorage:
             "version": version,
             "content": content,
             "content_hash": content_hash,
-            "collected_at": datetime.utcnow().isoformat()
+            "collected_at": now
         }
-        
-        try:
-            await self.versions_col.replace_one(
-                {"_id": version_id}, 
-                version_doc, 
-                upsert=True
-            )
-        except Exception as e:
-            logger.error(f"Failed to save version {version_id}: {e}")
-            raise
-
-        # 2. Update Page Metadata
-        # Ensure _id is set for the document
+        if _cctx is not None:
+            # ADF/HTML markup compresses 5-10x; cuts BSON size and the
+            # bytes Motor pushes over the wire on both write and read.
+            version_doc["content"] = Binary(_cctx.compress(content.encode("utf-8")))
+            version_doc["encoding"] = "zstd"
+        self._version_ops.append(ReplaceOne({"_id": version_id}, version_doc, upsert=True))
+
         metadata["_id"] = page_id
-        
-        # Add references to latest version
         metadata["latest_version_id"] = version_id
-        metadata["last_updated_at"] = datetime.utcnow().isoformat()
+        metadata["last_updated_at"] = now
+        self._page_ops.append(ReplaceOne({"_id": page_id}, metadata, upsert=True))
 
-        try:
-            await self.pages_col.replace_one(
-                {"_id": page_id},
-                metadata,
-                upsert=True
-            )
-        except Exception as e:
-            logger.error(f"Failed to save metadata for {page_id}: {e}")
-            raise
+    async def save_page(self, page_id: str, metadata: Dict[str, Any], content: str, version: int, content_hash: str):
+        """
+        Queue a page's version content and metadata for the next batched
+        flush. The write hits Mongo once the buffer reaches the flush
+        threshold, or on an explicit flush().
+        """
+        self._append_page_ops(page_id, metadata, content, version, content_hash,
+                              datetime.now(timezone.utc))
+        if len(self._version_ops) >= self._flush_threshold:
+            await self.flush()
+
+    async def flush(self):
+        """Flush buffered writes with one unordered bulk_write per collection."""
+        async with self._flush_lock:
+            if not self._version_ops and not self._page_ops:
+                return
+
+            version_ops, self._version_ops = self._version_ops, []
+            page_ops, self._page_ops = self._page_ops, []
+
+            try:
+                if version_ops:
+                    await self.versions_col.bulk_write(version_ops, ordered=False)
+                if page_ops:
+                    await self.pages_col.bulk_write(page_ops, ordered=False)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(page_ops)} buffered page writes: {e}")
+                raise
+
+    async def bulk_save_pages(self, batch: List[tuple]):
+        """
+        Save a batch of pages immediately with one bulk_write per collection.
+        Each item is (page_id, metadata, content, version, content_hash).
+        """
+        if not batch:
+            return
+
+        now = datetime.now(timezone.utc)
+        for page_id, metadata, content, version, content_hash in batch:
+            self._append_page_ops(page_id, metadata, content, version, content_hash, now)
 
+        await self.flush()
 
     async def get_all_pages(self):
         """
         Yields all pages with their metadata and content.
         Yields: (metadata, content)
+
+        Version content is resolved in batches with a single $in query per
+        batch rather than one find_one per page. A producer task keeps a
+        bounded queue of resolved pages filled while the consumer works, so
+        the next Mongo round-trip overlaps with downstream chunking and
+        embedding instead of serializing with it.
         """
-        cursor = self.pages_col.find({})
-        async for metadata in cursor:
-            page_id = metadata["_id"]
-            latest_version_id = metadata.get("latest_version_id")
-            
-            if not latest_version_id:
-                logger.warning(f"Page {page_id} has no latest_version_id, skipping.")
-                continue
-                
-            version_doc = await self.versions_col.find_one({"_id": latest_version_id})
-            if not version_doc:
-                logger.warning(f"Version {latest_version_id} not found for page {page_id}, skipping.")
-                continue
-            
-            content = version_doc.get("content")
-            yield metadata, content
+        batch_size = 200
+        queue: asyncio.Queue = asyncio.Queue(maxsize=32)
+
+        async def _drain(buf, out: List[tuple]):
+            version_ids = [m["latest_version_id"] for m in buf]
+            # Project down to the content fields; the version docs also
+            # carry page_id/version/content_hash/collected_at that this
+            # path never reads.
+            versions = {
+                v["_id"]: v
+                async for v in self.versions_col.find(
+                    {"_id": {"$in": version_ids}},
+                    {"content": 1, "encoding": 1}
+                )
+            }
+            for metadata in buf:
+                version_doc = versions.get(metadata["latest_version_id"])
+                if not version_doc:
+                    logger.warning(
+                        f"Version {metadata['latest_version_id']} not found for "
+                        f"page {metadata['_id']}, skipping."
+                    )
+                    continue
+                content = version_doc.get("content")
+                if version_doc.get("encoding") == "zstd":
+                    content = _dctx.decompress(content).decode("utf-8")
+                out.append((metadata, content))
+
+        async def _produce():
+            cursor = self.pages_col.find({}).batch_size(batch_size)
+            buffer: List[Dict[str, Any]] = []
+            try:
+                async for metadata in cursor:
+                    if not metadata.get("latest_version_id"):
+                        logger.warning(f"Page {metadata['_id']} has no latest_version_id, skipping.")
+                        continue
+
+                    buffer.append(metadata)
+                    if len(buffer) >= batch_size:
+                        resolved: List[tuple] = []
+                        await _drain(buffer, resolved)
+                        for item in resolved:
+                            await queue.put(item)
+                        buffer = []
+
+                if buffer:
+                    resolved = []
+                    await _drain(buffer, resolved)
+                    for item in resolved:
+                        await queue.put(item)
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(_produce())
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
@@ -1,26 +1,28 @@
 from abc import ABC, abstractmethod
 from typing import List
+import asyncio
+
+import httpx
+
+from confluence.config import OLLAMA_BASE_URL, OLLAMA_EMBEDDING_MODEL
 
 class Embedder(ABC):
     @abstractmethod
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         pass
-    
+
     @property
     @abstractmethod
     def dimension(self) -> int:
         pass
 
 
-import httpx
-from confluence.config import OLLAMA_BASE_URL, OLLAMA_EMBEDDING_MODEL
-
 class OpenAIEmbedder(Embedder):
     def __init__(self, api_key: str = None, model: str = "text-embedding-3-small"):
         self.model = model
         # self.client = OpenAI(api_key=api_key) # Placeholder for actual client
-        
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
         # Placeholder implementation
         print(f"Embedding {len(texts)} texts using {self.model}")
         return [[0.1] * 1536 for _ in texts]
@@ -30,26 +32,83 @@ class OpenAIEmbedder(Embedder):
         return 1536
 
 class OllamaEmbedder(Embedder):
-    def __init__(self, base_url: str = OLLAMA_BASE_URL, model: str = OLLAMA_EMBEDDING_MODEL):
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, model: str = OLLAMA_EMBEDDING_MODEL,
+                 concurrency: int = 16, batch_size: int = 64):
         self.base_url = base_url
         self.model = model
-        
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        embeddings = []
-        for text in texts:
-            response = httpx.post(
-                f"{self.base_url}/api/embeddings",
-                json={"model": self.model, "prompt": text},
-                timeout=60.0
+        self._sem = asyncio.Semaphore(concurrency)
+        self._client = None
+        self._batch_size = batch_size
+        # /api/embed accepts a list input and embeds it server-side in one
+        # request; older Ollama servers only have the per-prompt
+        # /api/embeddings, detected on first 404 and remembered.
+        self._batch_supported = True
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One pooled client for all requests; the old per-text httpx.post
+        # opened and closed a connection per embedding.
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=60.0,
+                limits=httpx.Limits(max_connections=32),
             )
-            response.raise_for_status()
-            embedding = response.json()["embedding"]
-            embeddings.append(embedding)
-        return embeddings
+        return self._client
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        client = self._get_client()
+
+        if self._batch_supported:
+            try:
+                return await self._embed_batched(client, texts)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 404:
+                    raise
+                self._batch_supported = False
+
+        return await self._embed_fanout(client, texts)
+
+    async def _embed_batched(self, client: httpx.AsyncClient, texts: List[str]) -> List[List[float]]:
+        async def embed_slice(batch: List[str]) -> List[List[float]]:
+            async with self._sem:
+                response = await client.post(
+                    "/api/embed",
+                    json={"model": self.model, "input": batch},
+                )
+                response.raise_for_status()
+                return response.json()["embeddings"]
+
+        # One request per batch_size texts; the server batches the forward
+        # passes instead of us paying HTTP overhead per text.
+        results = await asyncio.gather(*(
+            embed_slice(texts[i:i + self._batch_size])
+            for i in range(0, len(texts), self._batch_size)
+        ))
+        return [embedding for chunk in results for embedding in chunk]
+
+    async def _embed_fanout(self, client: httpx.AsyncClient, texts: List[str]) -> List[List[float]]:
+        async def embed_one(text: str) -> List[float]:
+            async with self._sem:
+                response = await client.post(
+                    "/api/embeddings",
+                    json={"model": self.model, "prompt": text},
+                )
+                response.raise_for_status()
+                return response.json()["embedding"]
+
+        # Fan out over the pool, bounded by the semaphore; gather preserves
+        # input order.
+        return list(await asyncio.gather(*(embed_one(t) for t in texts)))
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
 
     @property
     def dimension(self) -> int:
         # Check model dimension? For nomic-embed-text it's 768.
         #TODO implent properly
-        return 768 
-
+        return 768
@@ -1,20 +1,26 @@
 from typing import List, Dict, Any
+import asyncio
 import logging
-from motor.motor_asyncio import AsyncIOMotorClient
+from bson.binary import Binary, BinaryVectorDtype
 from pymongo import UpdateOne
 
 from chunking.chunker import Chunk
 from embedding.vector_store import VectorStore
-from confluence.config import MONGO_URI, MONGO_DB_NAME, MONGO_VECTOR_COLLECTION, MONGO_VECTOR_INDEX_NAME
+from confluence.config import MONGO_DB_NAME, MONGO_VECTOR_COLLECTION, MONGO_VECTOR_INDEX_NAME
+from confluence.mongo_client import get_client
 
 logger = logging.getLogger(__name__)
 
+# Keep bulk_writes below Mongo's 16MB message cap while still amortising
+# the round-trip; batches are written concurrently.
+_UPSERT_BATCH_SIZE = 500
+
 class MongoVectorStore(VectorStore):
     def __init__(self):
-        self.client = AsyncIOMotorClient(MONGO_URI)
+        self.client = get_client()
         self.db = self.client[MONGO_DB_NAME]
         self.collection = self.db[MONGO_VECTOR_COLLECTION]
-        
+
     async def upsert(self, chunks: List[Chunk], embeddings: List[List[float]]):
         operations = []
         for chunk, embedding in zip(chunks, embeddings):
@@ -23,16 +29,29 @@ class MongoVectorStore(VectorStore):
                 "doc_id": chunk.doc_id,
                 "chunk_index": chunk.chunk_index,
                 "text": chunk.text,
-                "embedding": embedding,
+                # Packed float32 BSON vector (binData subtype 9): ~3KB per
+                # 768-dim vector instead of ~6KB of per-element BSON
+                # doubles, and the only binary form $vectorSearch can index.
+                "embedding": Binary.from_vector(embedding, BinaryVectorDtype.FLOAT32),
                 "metadata": chunk.metadata
             }
             operations.append(
                 UpdateOne({"chunk_id": chunk.id}, {"$set": doc}, upsert=True)
             )
-            
-        if operations:
-            result = await self.collection.bulk_write(operations)
-            logger.info(f"Upserted {result.upserted_count + result.modified_count} chunks to MongoDB.")
+
+        if not operations:
+            return
+
+        # Unordered writes let the server apply ops in parallel; upserts
+        # keyed on chunk_id are independent so ordering doesn't matter.
+        results = await asyncio.gather(*(
+            self.collection.bulk_write(
+                operations[i:i + _UPSERT_BATCH_SIZE], ordered=False
+            )
+            for i in range(0, len(operations), _UPSERT_BATCH_SIZE)
+        ))
+        written = sum(r.upserted_count + r.modified_count for r in results)
+        logger.info(f"Upserted {written} chunks to MongoDB.")
 
     async def search(self, query_embedding: List[float], limit: int = 5) -> List[Chunk]:
         pipeline = [
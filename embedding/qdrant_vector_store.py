@@ -1,37 +1,155 @@
+import asyncio
 import logging
+import re
 import uuid
 from typing import List, Optional
-from qdrant_client import AsyncQdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import Distance, VectorParams, PointStruct
 
 from chunking.chunker import Chunk
 from embedding.vector_store import VectorStore
-from confluence.config import QDRANT_HOST, QDRANT_PORT, QDRANT_COLLECTION_NAME
+from confluence.config import (
+    QDRANT_HOST,
+    QDRANT_PORT,
+    QDRANT_GRPC_PORT,
+    QDRANT_PREFER_GRPC,
+    QDRANT_TIMEOUT,
+    QDRANT_COLLECTION_NAME,
+)
 
 logger = logging.getLogger(__name__)
 
+# Sub-batch size for upserts; one giant request stalls the server and
+# risks timeouts, while a few hundred points per call pipelines well.
+_UPSERT_BATCH_SIZE = 256
+
+# Chunk IDs are BLAKE2b hex digests, never hyphenated UUIDs, so a regex
+# precheck avoids paying for a ValueError per chunk in the old
+# try/except uuid.UUID route.
+_UUID_RE = re.compile(
+    r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+_NS = uuid.NAMESPACE_DNS
+
+# Payload keys lifted back onto the Chunk itself; everything else is
+# metadata. frozenset gives O(1) membership per key.
+_EXCLUDED = frozenset(("chunk_id", "doc_id", "chunk_index", "text"))
+
+# Qdrant's default; restored by finalize() after a bulk load.
+_INDEXING_THRESHOLD = 20000
+
+# One async client per process: every QdrantVectorStore (pipeline, tests,
+# unified ingestion) otherwise opens its own gRPC channel and repeats the
+# handshake and pool warmup.
+_CLIENT: Optional[AsyncQdrantClient] = None
+
+def _get_client() -> AsyncQdrantClient:
+    global _CLIENT
+    if _CLIENT is None:
+        # gRPC skips the REST/JSON serialization overhead on large vector
+        # payloads and multiplexes concurrent upserts over one channel.
+        _CLIENT = AsyncQdrantClient(
+            host=QDRANT_HOST,
+            port=QDRANT_PORT,
+            grpc_port=QDRANT_GRPC_PORT,
+            prefer_grpc=QDRANT_PREFER_GRPC,
+            timeout=QDRANT_TIMEOUT,
+        )
+    return _CLIENT
+
+async def close_client():
+    """Close the shared client on shutdown."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.close()
+        _CLIENT = None
+
 class QdrantVectorStore(VectorStore):
-    def __init__(self):
-        self.client = AsyncQdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    def __init__(self, bulk_indexing: bool = False):
+        self.client = _get_client()
         self.collection_name = QDRANT_COLLECTION_NAME
         self._collection_initialized = False
+        # Guards the lazy init: without it, the first wave of concurrent
+        # upserts all see the flag unset and race get/create_collection.
+        self._init_lock = asyncio.Lock()
+        # With bulk_indexing the collection is created with indexing
+        # disabled, so ingest CPU isn't spent re-optimizing a growing HNSW
+        # graph; finalize() turns indexing back on afterwards.
+        self._bulk_indexing = bulk_indexing
 
     async def _ensure_collection(self, vector_size: int):
         if self._collection_initialized:
             return
 
+        async with self._init_lock:
+            if self._collection_initialized:
+                return
+            await self._init_collection(vector_size)
+            self._collection_initialized = True
+
+    async def _init_collection(self, vector_size: int):
         collections = await self.client.get_collections()
         exists = any(c.name == self.collection_name for c in collections.collections)
 
         if not exists:
             logger.info(f"Creating Qdrant collection '{self.collection_name}' with size {vector_size}")
+            optimizers = None
+            if self._bulk_indexing:
+                optimizers = models.OptimizersConfigDiff(indexing_threshold=0)
             await self.client.create_collection(
                 collection_name=self.collection_name,
-                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+                optimizers_config=optimizers,
+                # int8 vectors kept in RAM: search reads a quarter of the
+                # memory bandwidth of fp32; originals stay on disk for
+                # rescoring.
+                quantization_config=models.ScalarQuantization(
+                    scalar=models.ScalarQuantizationConfig(
+                        type=models.ScalarType.INT8,
+                        always_ram=True
+                    )
+                )
             )
-        
-        self._collection_initialized = True
+
+            # Keyword indexes so the space_key/doc_id filters are resolved
+            # server-side before graph traversal instead of by scanning
+            # payloads inline with the distance computations.
+            for field in ("space_key", "doc_id"):
+                await self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field,
+                    field_schema=models.PayloadSchemaType.KEYWORD
+                )
+
+    async def finalize(self):
+        """Re-enable HNSW indexing after a bulk load; no-op otherwise."""
+        if not self._bulk_indexing or not self._collection_initialized:
+            return
+        await self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizer_config=models.OptimizersConfigDiff(indexing_threshold=_INDEXING_THRESHOLD)
+        )
+        logger.info(f"Re-enabled indexing on '{self.collection_name}' (threshold {_INDEXING_THRESHOLD})")
+
+    @staticmethod
+    def _point_id(chunk_id: str) -> str:
+        # Qdrant requires UUIDs or integers for IDs. If chunk_id is a valid
+        # UUID string we use it directly, otherwise we derive a UUID from it.
+        if _UUID_RE.match(chunk_id):
+            return chunk_id
+        return str(uuid.uuid5(_NS, chunk_id))
+
+    @staticmethod
+    def _payload(chunk: Chunk) -> dict:
+        # One copy of the metadata dict, then in-place assignments; a
+        # {**metadata} merge would build an extra intermediate dict.
+        payload = chunk.metadata.copy()
+        payload["chunk_id"] = chunk.id
+        payload["doc_id"] = chunk.doc_id
+        payload["chunk_index"] = chunk.chunk_index
+        payload["text"] = chunk.text
+        return payload
 
     async def upsert(self, chunks: List[Chunk], embeddings: List[List[float]]):
         if not chunks:
@@ -41,70 +159,119 @@ class QdrantVectorStore(VectorStore):
         vector_size = len(embeddings[0])
         await self._ensure_collection(vector_size)
 
-        points = []
-        for chunk, embedding in zip(chunks, embeddings):
-            # Qdrant requires UUIDs or integers for IDs. 
-            # If chunk.id is a valid UUID string, we use it directly. 
-            # Otherwise we generate a UUID from it.
-            try:
-                point_id = str(uuid.UUID(chunk.id))
-            except ValueError:
-                point_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, chunk.id))
-
-            payload = {
-                "chunk_id": chunk.id,
-                "doc_id": chunk.doc_id,
-                "chunk_index": chunk.chunk_index,
-                "text": chunk.text,
-                **chunk.metadata
-            }
-
-            points.append(PointStruct(
-                id=point_id,
+        points = [
+            PointStruct(
+                id=self._point_id(chunk.id),
                 vector=embedding,
-                payload=payload
-            ))
+                payload=self._payload(chunk)
+            )
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
 
-        await self.client.upsert(
-            collection_name=self.collection_name,
-            points=points
-        )
+        # wait=False lets the server acknowledge before indexing, so the
+        # sub-batches pipeline instead of serializing on each other.
+        await asyncio.gather(*(
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=points[i:i + _UPSERT_BATCH_SIZE],
+                wait=False
+            )
+            for i in range(0, len(points), _UPSERT_BATCH_SIZE)
+        ))
         logger.info(f"Upserted {len(points)} chunks to Qdrant collection '{self.collection_name}'")
 
-    async def search(self, query_embedding: List[float], limit: int = 5, space_key: Optional[str] = None) -> List[Chunk]:
-        # Create filter if space_key is provided
-        query_filter = None
-        if space_key:
-            query_filter = models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="space_key",
-                        match=models.MatchValue(value=space_key)
-                    )
-                ]
+    def bulk_upload(self, ids: List[str], vectors: List[List[float]], payloads: List[dict],
+                    parallel: int = 8, batch_size: int = 512):
+        """
+        Backfill path: upload_collection streams points through parallel
+        worker processes, saturating server ingest bandwidth in a way
+        per-page upserts cannot. Uses a throwaway synchronous client since
+        the parallel uploader manages its own workers.
+        """
+        client = QdrantClient(
+            host=QDRANT_HOST,
+            port=QDRANT_PORT,
+            grpc_port=QDRANT_GRPC_PORT,
+            prefer_grpc=QDRANT_PREFER_GRPC,
+            timeout=QDRANT_TIMEOUT,
+        )
+        try:
+            client.upload_collection(
+                collection_name=self.collection_name,
+                vectors=vectors,
+                payload=payloads,
+                ids=ids,
+                parallel=parallel,
+                batch_size=batch_size,
             )
+        finally:
+            client.close()
+        logger.info(f"Bulk uploaded {len(ids)} points to Qdrant collection '{self.collection_name}'")
 
-        results = await self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_embedding,
-            limit=limit,
-            query_filter=query_filter
+    @staticmethod
+    def _space_filter(space_key: Optional[str]) -> Optional[models.Filter]:
+        if not space_key:
+            return None
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="space_key",
+                    match=models.MatchValue(value=space_key)
+                )
+            ]
         )
 
+    @staticmethod
+    def _points_to_chunks(points) -> List[Chunk]:
         chunks = []
-        for point in results:
+        for point in points:
             payload = point.payload
-            
+
             # Reconstruct Chunk object
             # Note: total_chunks is not stored in payload currently, setting to 0
             chunk = Chunk(
                 id=payload.get("chunk_id"),
                 doc_id=payload.get("doc_id"),
                 chunk_index=payload.get("chunk_index"),
-                total_chunks=0, 
+                total_chunks=0,
                 text=payload.get("text"),
-                metadata={k: v for k, v in payload.items() if k not in ["chunk_id", "doc_id", "chunk_index", "text"]}
+                metadata={k: v for k, v in payload.items() if k not in _EXCLUDED}
             )
             chunks.append(chunk)
 
         return chunks
+
+    async def search(self, query_embedding: List[float], limit: int = 5, space_key: Optional[str] = None) -> List[Chunk]:
+        # query_points is the Query API; client.search was removed from
+        # recent qdrant-client releases.
+        response = await self.client.query_points(
+            collection_name=self.collection_name,
+            query=query_embedding,
+            limit=limit,
+            query_filter=self._space_filter(space_key)
+        )
+
+        return self._points_to_chunks(response.points)
+
+    async def search_many(self, query_embeddings: List[List[float]], limit: int = 5,
+                          space_key: Optional[str] = None) -> List[List[Chunk]]:
+        """
+        Run N queries in one round-trip via query_batch_points; callers
+        issuing a query per call pay a full RTT each. Returns one chunk list
+        per query, in input order.
+        """
+        query_filter = self._space_filter(space_key)
+        requests = [
+            models.QueryRequest(
+                query=v,
+                limit=limit,
+                filter=query_filter,
+                with_payload=True
+            )
+            for v in query_embeddings
+        ]
+        responses = await self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=requests
+        )
+        return [self._points_to_chunks(response.points) for response in responses]
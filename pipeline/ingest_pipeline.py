@@ -1,13 +1,22 @@
 import asyncio
 import logging
+import os
 import sys
 from typing import List
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:  # pragma: no cover - orjson is in requirements
+    import json
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
 from confluence.storage import MongoStorage
-from transform.confluence_to_canonical import AdfToCanonicalConverter
+from transform.confluence_to_canonical import DEFAULT_CONVERTER
 from chunking.chunker import Chunker, Chunk
 from embedding.embedder import OllamaEmbedder
-from embedding.embedder import OllamaEmbedder
 from embedding.qdrant_vector_store import QdrantVectorStore
 
 from confluence.config import setup_logging
@@ -17,62 +26,149 @@ logger = logging.getLogger(__name__)
 class IngestPipeline:
     def __init__(self):
         self.storage = MongoStorage()
-        self.converter = AdfToCanonicalConverter()
+        # Shared module-level converter: convert() resets per document, so
+        # pipeline instances don't each need their own.
+        self.converter = DEFAULT_CONVERTER
         self.chunker = Chunker()
         self.embedder = OllamaEmbedder()
-        self.vector_store = QdrantVectorStore()
+        # Full runs re-ingest everything, so indexing is deferred until
+        # finalize(); this only takes effect when the collection is created.
+        self.vector_store = QdrantVectorStore(bulk_indexing=True)
+        # Pages in flight at once; each page is embed+upsert I/O, so
+        # overlapping them hides the Ollama and Qdrant round-trips.
+        self.concurrency = int(os.getenv("PIPELINE_CONCURRENCY", 16))
+        self._sem = asyncio.Semaphore(self.concurrency)
+
+    def chunk_only(self, metadata, content) -> List[Chunk]:
+        """
+        Parse, convert and chunk a page without embedding or storing.
+        Raises on malformed ADF; callers decide how to isolate the error.
+        """
+        if isinstance(content, str):
+            adf_json = _loads(content)
+        else:
+            adf_json = content
+
+        canonical_doc = self.converter.convert(metadata, adf_json)
+
+        # 2. Clean (Implicit in Transform layer)
+
+        # 3. Chunk
+        return self.chunker.chunk_document(canonical_doc)
+
+    async def store(self, chunks: List[Chunk], embeddings: List[List[float]]):
+        await self.vector_store.upsert(chunks, embeddings)
 
     async def process_page(self, metadata, content):
         page_id = metadata.get("page_id")
         title = metadata.get("title", "Unknown")
-        
+
         logger.info(f"Processing page: {title} ({page_id})")
-        
+
         try:
-            import json
-            if isinstance(content, str):
-                try:
-                    adf_json = json.loads(content)
-                except json.JSONDecodeError:
-                    logger.error(f"Failed to parse ADF JSON for {page_id}")
-                    return False
-            else:
-                adf_json = content
-            
-            canonical_doc = self.converter.convert(metadata, adf_json)
-            
-            # 2. Clean (Implicit in Transform layer)
-            
-            # 3. Chunk
-            chunks = self.chunker.chunk_document(canonical_doc)
+            try:
+                chunks = self.chunk_only(metadata, content)
+            except _JSONDecodeError:
+                logger.error(f"Failed to parse ADF JSON for {page_id}")
+                return False
+
             logger.info(f"Generated {len(chunks)} chunks for {page_id}")
-            
+
             if not chunks:
                 return True
 
             # 4. Embed
             texts_to_embed = [chunk.text for chunk in chunks]
-            embeddings = self.embedder.embed_texts(texts_to_embed)
-            
+            embeddings = await self.embedder.embed_texts(texts_to_embed)
+
             # 5. Store
-            await self.vector_store.upsert(chunks, embeddings)
-            
+            await self.store(chunks, embeddings)
+
             return True
-            
+
         except Exception as e:
             logger.error(f"Error processing page {page_id}: {e}", exc_info=True)
             return False
 
+    async def process_page_guarded(self, metadata, content):
+        """process_page capped by the pipeline semaphore, for fan-out callers."""
+        async with self._sem:
+            return await self.process_page(metadata, content)
+
     async def run(self):
         logger.info("Starting ingestion pipeline...")
-        
+
         processed_count = 0
-        
+        tasks = []
+
+        # Dispatch a bounded window of pages concurrently instead of
+        # serializing embed and upsert latency page by page.
         async for metadata, content in self.storage.get_all_pages():
-            success = await self.process_page(metadata, content)
-            if success:
+            tasks.append(asyncio.create_task(self.process_page_guarded(metadata, content)))
+            if len(tasks) >= self.concurrency:
+                results = await asyncio.gather(*tasks)
+                processed_count += sum(1 for ok in results if ok)
+                tasks = []
+
+        if tasks:
+            results = await asyncio.gather(*tasks)
+            processed_count += sum(1 for ok in results if ok)
+
+        await self.vector_store.finalize()
+        logger.info(f"Pipeline finished. Processed {processed_count} pages.")
+
+    async def run_batched(self, pages_per_batch: int = 8):
+        """
+        Backfill mode: coalesce chunks from a window of pages into one
+        embed_texts call, then slice the embeddings back per page. One
+        large embedding request amortizes per-request overhead better
+        than run()'s page-at-a-time fan-out when every page is new.
+        """
+        logger.info("Starting batched ingestion pipeline...")
+
+        processed_count = 0
+        batch: List[tuple] = []  # (page_id, chunks)
+
+        async def _flush(batch):
+            nonlocal processed_count
+            texts = [c.text for _, chunks in batch for c in chunks]
+            try:
+                embeddings = await self.embedder.embed_texts(texts)
+            except Exception as e:
+                logger.error(f"Embedding failed for a batch of {len(batch)} pages: {e}", exc_info=True)
+                return
+
+            offset = 0
+            for page_id, chunks in batch:
+                page_embeddings = embeddings[offset:offset + len(chunks)]
+                offset += len(chunks)
+                try:
+                    await self.store(chunks, page_embeddings)
+                    processed_count += 1
+                except Exception as e:
+                    logger.error(f"Error storing page {page_id}: {e}", exc_info=True)
+
+        async for metadata, content in self.storage.get_all_pages():
+            page_id = metadata.get("page_id")
+            try:
+                chunks = self.chunk_only(metadata, content)
+            except Exception as e:
+                logger.error(f"Error chunking page {page_id}: {e}", exc_info=True)
+                continue
+
+            if not chunks:
                 processed_count += 1
-                
+                continue
+
+            batch.append((page_id, chunks))
+            if len(batch) >= pages_per_batch:
+                await _flush(batch)
+                batch = []
+
+        if batch:
+            await _flush(batch)
+
+        await self.vector_store.finalize()
         logger.info(f"Pipeline finished. Processed {processed_count} pages.")
 
 async def main():
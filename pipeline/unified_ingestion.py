@@ -23,13 +23,21 @@ async def main():
         logger.info("Listening for updates from Confluence...")
         
         processed_count = 0
-        
-        # Iterate over updates as they are fetched
+        tasks = []
+
+        # Iterate over updates as they are fetched, processing a bounded
+        # window of pages concurrently (capped by the pipeline semaphore).
         async for metadata, content in extractor.yield_updates():
-            success = await pipeline.process_page(metadata, content)
-            if success:
-                processed_count += 1
-            
+            tasks.append(asyncio.create_task(pipeline.process_page_guarded(metadata, content)))
+            if len(tasks) >= pipeline.concurrency:
+                processed_count += sum(1 for ok in await asyncio.gather(*tasks) if ok)
+                tasks = []
+
+        if tasks:
+            processed_count += sum(1 for ok in await asyncio.gather(*tasks) if ok)
+
+        await pipeline.vector_store.finalize()
+
         stats = extractor.stats
         
         logger.info(f"Sync completed successfully.")
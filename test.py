@@ -11,7 +11,7 @@ async def main():
     print(f"Querying for: '{query}'")
 
     # Generate embedding
-    embeddings = embedder.embed_texts([query])
+    embeddings = await embedder.embed_texts([query])
     query_embedding = embeddings[0]
     
     # Test 1: Search without filter
@@ -1,30 +1,39 @@
 from dataclasses import dataclass, fields, field
-from typing import List, Optional, Dict, Any
-from enum import Enum
+from typing import List, Optional, Dict, Any, Final
 
-class BlockType(Enum):
-    PARAGRAPH = "paragraph"
-    HEADING = "heading"
-    CODE = "code"
-    LIST_ITEM = "list_item"
-    TABLE = "table"
-    IMAGE = "image"
-    UNKNOWN = "unknown"
+class BlockType:
+    """
+    Block type tags as plain interned strings. These are pure
+    discriminators that end up serialized as strings anyway; an Enum adds
+    a wrapper object plus attribute indirection on every Block built
+    during conversion, while comparing interned strings is a pointer
+    check.
+    """
+    PARAGRAPH: Final[str] = "paragraph"
+    HEADING: Final[str] = "heading"
+    CODE: Final[str] = "code"
+    LIST_ITEM: Final[str] = "list_item"
+    TABLE: Final[str] = "table"
+    IMAGE: Final[str] = "image"
+    UNKNOWN: Final[str] = "unknown"
 
-@dataclass
+# slots=True drops the per-instance __dict__ (~100+ bytes each on
+# CPython 3.11); blocks number in the hundreds of thousands on a large
+# corpus, so the compact layout matters for RSS and cache behavior.
+@dataclass(slots=True)
 class Block:
     content: str
-    type: BlockType
+    type: str
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     heading: str
     level: int
     blocks: List[Block]
     full_text: str = ""  # Concatenated text of blocks, populated during processing
 
-@dataclass
+@dataclass(slots=True)
 class CanonicalDocument:
     id: str
     title: str
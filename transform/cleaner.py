@@ -1,5 +1,19 @@
+import functools
 import re
 
+# Precompiled once; re.sub with a literal pattern re-hashes and looks up
+# the regex cache on every call, which adds up across every text node of
+# every page.
+_WS_RE = re.compile(r'[ \t]+')
+
+# Translate table for the NBSP substitution: one C-level scan, and easy
+# to extend with other unicode-space normalizations later.
+_NBSP_TABLE = str.maketrans({'\xa0': ' '})
+
+# Boilerplate strings ("N/A", column headers, template snippets) repeat
+# heavily across table-rich pages; memoizing turns repeats into a dict
+# hit. Inputs and outputs are immutable strings, so caching is safe.
+@functools.lru_cache(maxsize=8192)
 def clean_text(text: str) -> str:
     """
     Deterministic whitespace cleaning.
@@ -13,13 +27,13 @@ def clean_text(text: str) -> str:
         return ""
     
     # Replace non-breaking spaces
-    text = text.replace('\xa0', ' ')
+    text = text.translate(_NBSP_TABLE)
     
     # Collapse multiple spaces (but keep newlines for now, or collapse them too?)
     # If we want to preserve block integrity, we typically handle newlines at block level.
     # Inside a text block (like paragraph), newlines might be semantic or soft wraps.
     # Let's collapse runs of spaces/tabs to single space
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     
     # Strip
     return text.strip()
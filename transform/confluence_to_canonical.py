@@ -1,5 +1,6 @@
 import json
 import logging
+import sys
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
@@ -8,6 +9,21 @@ from transform.cleaner import clean_text
 
 logger = logging.getLogger(__name__)
 
+# Shared default for attrs lookups: a `{}` literal default allocates a
+# fresh dict on every .get() call in the per-node hot path.
+_EMPTY: Dict[str, Any] = {}
+
+# Short cleaned strings repeat heavily (table cells like "Yes"/"N/A",
+# template snippets); interning lets every occurrence share one object
+# and makes downstream equality checks a pointer compare. The bound
+# keeps huge paragraphs out of the intern table.
+_INTERN_MAX_LEN = 64
+
+def _intern_short(cleaned: str) -> str:
+    if cleaned and len(cleaned) <= _INTERN_MAX_LEN:
+        return sys.intern(cleaned)
+    return cleaned
+
 class AdfToCanonicalConverter:
     def __init__(self):
         self.sections: List[Section] = []
@@ -16,6 +32,24 @@ class AdfToCanonicalConverter:
         self.current_section = Section(heading="Introduction", level=0, blocks=[])
         self.sections.append(self.current_section)
 
+        # URL concatenations keyed by (base, webui): pages in a space share
+        # the same base, and the cached string is reference-shared by every
+        # downstream consumer that retains the document URL.
+        self._base_url_cache: Dict[tuple, str] = {}
+
+        # O(1) dispatch on node type instead of walking an if/elif chain of
+        # string compares for every node.
+        self._handlers = {
+            "doc": self._handle_doc,
+            "heading": self._handle_heading,
+            "paragraph": self._handle_paragraph,
+            "codeBlock": self._handle_code_block,
+            "bulletList": self._handle_list,
+            "orderedList": self._handle_list,
+            "listItem": self._handle_list_item,
+            "table": self._handle_table,
+        }
+
     def convert(self, metadata: Dict[str, Any], adf_json: Dict[str, Any]) -> CanonicalDocument:
         self._reset()
         
@@ -27,10 +61,10 @@ class AdfToCanonicalConverter:
         if len(self.sections) > 1 and not self.sections[0].blocks and not self.sections[0].full_text:
              self.sections.pop(0)
 
-        # Populate full_text for sections
+        # Populate full_text for sections; join straight off the generator
+        # rather than materializing an intermediate content list per section.
         for section in self.sections:
-            texts = [b.content for b in section.blocks]
-            section.full_text = "\n".join(texts)
+            section.full_text = "\n".join(b.content for b in section.blocks)
             
         return CanonicalDocument(
             id=metadata.get("page_id") or metadata.get("_id"), # Handle both raw responses and stored Mongo docs
@@ -49,112 +83,142 @@ class AdfToCanonicalConverter:
     def _construct_url(self, metadata: Dict[str, Any]) -> str:
         # This is a bit hacky without base URL, but we can store it or pass it. 
         # For now, placeholder or use links if available in metadata.
-        base = metadata.get("_links", {}).get("base", "")
-        webui = metadata.get("_links", {}).get("webui", "")
+        links = metadata.get("_links", _EMPTY)
+        base = links.get("base", "")
+        webui = links.get("webui", "")
         if base and webui:
-            return base + webui
+            key = (base, webui)
+            url = self._base_url_cache.get(key)
+            if url is None:
+                url = self._base_url_cache.setdefault(key, base + webui)
+            return url
         return ""
 
     def _process_node(self, node: Dict[str, Any]):
-        node_type = node.get("type")
-        content = node.get("content", [])
+        handler = self._handlers.get(node.get("type"), self._handle_fallback)
+        handler(node)
 
-        if node_type == "doc":
-            for child in content:
-                self._process_node(child)
-        
-        elif node_type == "heading":
-            level = node.get("attrs", {}).get("level", 1)
-            text = self._extract_text(node)
-            cleaned_heading = clean_text(text)
-            
-            # Start new section
-            new_section = Section(heading=cleaned_heading, level=level, blocks=[])
-            self.sections.append(new_section)
-            self.current_section = new_section
-            
-        elif node_type == "paragraph":
-            text = self._extract_text(node)
-            cleaned_text = clean_text(text)
-            if cleaned_text:
-                self.current_section.blocks.append(Block(
-                    content=cleaned_text,
-                    type=BlockType.PARAGRAPH
-                ))
-                
-        elif node_type == "codeBlock":
-            text = self._extract_text(node) 
-            # Code blocks often want to preserve structure, so maybe less aggressive cleaning?
-            # But clean_text mostly does whitespace collapsing which might harm code indentation.
-            # Let's just strip ends for code.
-            language = node.get("attrs", {}).get("language", "text")
-            if text and text.strip():
-                 self.current_section.blocks.append(Block(
-                    content=text, # Preserve internal whitespace for code
-                    type=BlockType.CODE,
-                    metadata={"language": language}
-                ))
-
-        elif node_type == "bulletList" or node_type == "orderedList":
-             # Flatten lists for now or handle them as block items
-             for child in content:
-                 self._process_node(child)
-
-        elif node_type == "listItem":
-            # List items usually contain paragraphs. 
-            # We want to extract content but maybe mark it as list item.
-            # Simple approach: flatten to text.
-            text = self._extract_text(node)
-            cleaned = clean_text(text)
-            if cleaned:
-                 self.current_section.blocks.append(Block(
-                    content=f"- {cleaned}",
-                    type=BlockType.LIST_ITEM
-                ))
-        
-        elif node_type == "table":
-            # Tables are complex. Simple extraction: row by row text.
-            # Better: Markdown representation?
-            # For this MVP, let's extract text row by row.
-            table_text = self._extract_table_text(node)
-            if table_text:
-                self.current_section.blocks.append(Block(
-                    content=table_text,
-                    type=BlockType.TABLE
-                ))
-        
-        else:
-            # Fallback for other types (blockquote, panel, etc): extract text
-             text = self._extract_text(node)
-             cleaned = clean_text(text)
-             # Avoid empty blocks
-             if cleaned:
-                 self.current_section.blocks.append(Block(
-                     content=cleaned,
-                     type=BlockType.UNKNOWN
-                 ))
+    def _handle_doc(self, node: Dict[str, Any]):
+        for child in node.get("content", []):
+            self._process_node(child)
+
+    def _handle_heading(self, node: Dict[str, Any]):
+        level = node.get("attrs", _EMPTY).get("level", 1)
+        text = self._extract_text(node)
+        cleaned_heading = clean_text(text)
+
+        # Start new section
+        new_section = Section(heading=cleaned_heading, level=level, blocks=[])
+        self.sections.append(new_section)
+        self.current_section = new_section
+
+    def _handle_paragraph(self, node: Dict[str, Any]):
+        text = self._extract_text(node)
+        cleaned_text = clean_text(text)
+        if cleaned_text:
+            self.current_section.blocks.append(Block(
+                content=_intern_short(cleaned_text),
+                type=BlockType.PARAGRAPH
+            ))
+
+    def _handle_code_block(self, node: Dict[str, Any]):
+        text = self._extract_text(node)
+        # Code blocks often want to preserve structure, so maybe less aggressive cleaning?
+        # But clean_text mostly does whitespace collapsing which might harm code indentation.
+        # Let's just strip ends for code.
+        language = node.get("attrs", _EMPTY).get("language", "text")
+        if text and text.strip():
+            self.current_section.blocks.append(Block(
+                content=text, # Preserve internal whitespace for code
+                type=BlockType.CODE,
+                metadata={"language": language}
+            ))
+
+    def _handle_list(self, node: Dict[str, Any]):
+        # Flatten lists for now or handle them as block items.
+        # Only listItem children are dispatched: _handle_list_item extracts
+        # the item's whole subtree (including nested lists), so recursing
+        # generically here would walk the same nodes a second time.
+        for child in node.get("content", []):
+            if child.get("type") == "listItem":
+                self._handle_list_item(child)
+
+    def _handle_list_item(self, node: Dict[str, Any]):
+        # List items usually contain paragraphs. 
+        # We want to extract content but maybe mark it as list item.
+        # Simple approach: flatten to text.
+        text = self._extract_text(node)
+        cleaned = clean_text(text)
+        if cleaned:
+            self.current_section.blocks.append(Block(
+                content=_intern_short("- " + cleaned),
+                type=BlockType.LIST_ITEM
+            ))
+
+    def _handle_table(self, node: Dict[str, Any]):
+        # Tables are complex. Simple extraction: row by row text.
+        # Better: Markdown representation?
+        # For this MVP, let's extract text row by row.
+        table_text = self._extract_table_text(node)
+        if table_text:
+            self.current_section.blocks.append(Block(
+                content=table_text,
+                type=BlockType.TABLE
+            ))
+
+    def _handle_fallback(self, node: Dict[str, Any]):
+        # Fallback for other types (blockquote, panel, etc): extract text
+        text = self._extract_text(node)
+        cleaned = clean_text(text)
+        # Avoid empty blocks
+        if cleaned:
+            self.current_section.blocks.append(Block(
+                content=_intern_short(cleaned),
+                type=BlockType.UNKNOWN
+            ))
 
     def _extract_text(self, node: Dict[str, Any]) -> str:
-        """Recursively extract text from a node."""
-        node_type = node.get("type")
-        
-        if node_type == "text":
-            return node.get("text", "")
-        
-        content = node.get("content", [])
-        texts = [self._extract_text(child) for child in content]
-        return "".join(texts)
+        """
+        Extract all text beneath a node with an explicit stack.
+        Fragments accumulate in one list joined once at the end, instead of
+        a recursive call (frame + transient list + join) per inner node.
+        """
+        parts: List[str] = []
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if n.get("type") == "text":
+                parts.append(n.get("text", ""))
+                continue
+            content = n.get("content")
+            if content:
+                # Reversed so text is emitted in document order.
+                stack.extend(reversed(content))
+        return "".join(parts)
 
     def _extract_table_text(self, table_node: Dict[str, Any]) -> str:
-        rows = []
-        content = table_node.get("content", [])
-        for row_node in content:
-            if row_node.get("type") == "tableRow":
-                cells = []
-                for cell_node in row_node.get("content", []):
-                    # cell content is usually paragraph, so extract text
-                    cell_text = self._extract_text(cell_node)
-                    cells.append(clean_text(cell_text))
-                rows.append(" | ".join(cells))
-        return "\n".join(rows)
+        # Rows and cells write into one shared parts list with separators
+        # inserted inline, instead of a per-row cell list + join and a
+        # second join over rows.
+        parts: List[str] = []
+        for row_node in table_node.get("content", ()):
+            if row_node.get("type") != "tableRow":
+                continue
+            if parts:
+                parts.append("\n")
+            first_cell = True
+            for cell_node in row_node.get("content", ()):
+                if first_cell:
+                    first_cell = False
+                else:
+                    parts.append(" | ")
+                # cell content is usually paragraph, so extract text
+                parts.append(clean_text(self._extract_text(cell_node)))
+        return "".join(parts)
+
 
+# Shared instance for callers that convert one document at a time:
+# convert() starts with _reset(), so a fresh converter per document only
+# buys allocator churn. Safe under asyncio concurrency because convert()
+# runs without an await point.
+DEFAULT_CONVERTER = AdfToCanonicalConverter()